@@ -0,0 +1,68 @@
+# backend/check_import_time.py
+#
+# Measures how long `import backend.main` takes in a fresh interpreter and fails
+# if it goes over the budget. Cold start matters on serverless hosts, so run this
+# after adding imports:
+#
+#     python -m backend.check_import_time            # default 500 ms budget
+#     IMPORT_BUDGET_MS=300 python -m backend.check_import_time
+
+import os
+import re
+import subprocess
+import sys
+
+DEFAULT_BUDGET_MS = 500
+MODULE = "backend.main"
+
+
+def measure_import_time(module: str = MODULE, runs: int = 5):
+    """
+    Imports the module in a new interpreter `runs` times using `-X importtime`
+    and returns (best cumulative time in ms, the 10 slowest imports of that run).
+    The best run is used so a busy machine doesn't cause false failures.
+    """
+    best_ms, best_slowest = None, []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+        # Lines look like: "import time:   self [us] |  cumulative | imported package"
+        timings = []
+        for line in result.stderr.splitlines():
+            match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|\s*(.+)", line)
+            if match:
+                timings.append((int(match.group(2)), match.group(3).strip()))
+
+        total_us = next((us for us, name in timings if name == module), None)
+        if total_us is None:
+            raise RuntimeError(f"No import timing found for {module}")
+
+        total_ms = total_us / 1000
+        if best_ms is None or total_ms < best_ms:
+            best_ms = total_ms
+            # Only top-level packages, otherwise the list is just the same tree repeated.
+            top_level = [(us, name) for us, name in timings if "." not in name]
+            best_slowest = sorted(top_level, reverse=True)[:10]
+    return best_ms, best_slowest
+
+
+if __name__ == "__main__":
+    budget_ms = float(os.environ.get("IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS))
+    total_ms, slowest = measure_import_time()
+
+    print(f"import {MODULE}: {total_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+    print("Slowest top-level imports:")
+    for us, name in slowest:
+        print(f"    {us / 1000:8.1f} ms  {name}")
+
+    if total_ms > budget_ms:
+        print(f"\nFAILED: import time is over budget by {total_ms - budget_ms:.1f} ms")
+        sys.exit(1)
+    print("\nOK: import time is within budget")
@@ -0,0 +1,15 @@
+# backend/config.py
+from functools import lru_cache
+from pathlib import Path
+
+# The .env file is expected in the project root (one level above `backend/`).
+# Nothing is loaded when this module is imported; load_env() is called the
+# first time settings are needed, whichever storage backend is in use.
+env_path = Path(__file__).parent.parent / ".env"
+
+
+@lru_cache(maxsize=None)
+def load_env() -> None:
+    # python-dotenv is imported here so it's only paid for once, on first use.
+    from dotenv import load_dotenv
+    load_dotenv(dotenv_path=env_path)
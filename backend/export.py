@@ -0,0 +1,136 @@
+# backend/export.py
+#
+# Turns the chunks from StorageBackend.iter_adventures() into a byte stream for
+# the /adventures/export endpoint. Each chunk is encoded and sent as soon as it's
+# read, so memory use depends on the chunk size, not on the size of the catalog.
+
+import csv
+import io
+import json
+import zlib
+from typing import Iterable, Iterator, List, Literal
+
+from . import schemas
+
+ExportFormat = Literal["ndjson", "csv", "arrow"]
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+EXPORT_COLUMNS = list(schemas.Adventure.model_fields)
+
+
+def _normalise(chunk: List[dict]) -> List[schemas.Adventure]:
+    # Backends return dates as strings or datetimes depending on the database,
+    # so every row goes through the schema to come out the same way.
+    return [schemas.Adventure.model_validate(row) for row in chunk]
+
+
+def _ndjson(chunks: Iterable[List[dict]]) -> Iterator[bytes]:
+    for chunk in chunks:
+        yield "".join(
+            json.dumps(adventure.model_dump(mode="json")) + "\n"
+            for adventure in _normalise(chunk)
+        ).encode("utf-8")
+
+
+def _csv(chunks: Iterable[List[dict]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    for chunk in chunks:
+        for adventure in _normalise(chunk):
+            writer.writerow(adventure.model_dump(mode="json"))
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    # If there were no rows, the header still needs sending.
+    if buffer.getvalue():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def arrow_schema():
+    import pyarrow as pa
+    return pa.schema([
+        ("unique_id", pa.string()),
+        ("provider_name", pa.string()),
+        ("trip_name", pa.string()),
+        ("url", pa.string()),
+        ("image_url", pa.string()),
+        ("price", pa.float64()),
+        ("currency", pa.string()),
+        ("departure_date", pa.timestamp("us", tz="UTC")),
+        ("duration", pa.int64()),
+        ("location", pa.string()),
+        ("activity_type", pa.string()),
+        ("created_at", pa.timestamp("us", tz="UTC")),
+        ("updated_at", pa.timestamp("us", tz="UTC")),
+    ])
+
+
+def _arrow(chunks: Iterable[List[dict]]) -> Iterator[bytes]:
+    # pyarrow is optional and only imported when an Arrow export is asked for.
+    import pyarrow as pa
+
+    schema = arrow_schema()
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for chunk in chunks:
+            rows = [adventure.model_dump() for adventure in _normalise(chunk)]
+            writer.write_batch(pa.RecordBatch.from_pylist(rows, schema=schema))
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+    # Closing the writer adds the end-of-stream marker.
+    yield sink.getvalue()
+
+
+def encode_export(chunks: Iterable[List[dict]], export_format: ExportFormat) -> Iterator[bytes]:
+    """
+    Encodes the chunks as NDJSON, CSV or an Arrow IPC stream.
+    """
+    encoders = {"ndjson": _ndjson, "csv": _csv, "arrow": _arrow}
+    return encoders[export_format](chunks)
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """
+    True if an Accept-Encoding header allows gzip. A q-value of 0 means the
+    client refuses that coding, so 'gzip;q=0' is a no. A '*' entry covers gzip
+    when gzip isn't listed by name.
+    """
+    qvalues = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qvalues[coding] = q
+
+    if "gzip" in qvalues:
+        return qvalues["gzip"] > 0
+    return qvalues.get("*", 0) > 0
+
+
+def gzip_stream(data: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Gzips a byte stream as it goes, one piece at a time.
+    """
+    # wbits=31 makes zlib write a gzip header and trailer instead of raw zlib.
+    compressor = zlib.compressobj(wbits=31)
+    for piece in data:
+        compressed = compressor.compress(piece)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -1,16 +1,29 @@
 # backend/main.py
 
-from fastapi import FastAPI, Depends, HTTPException, status
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, status
 from typing import List, Optional
-from supabase import Client
 
 # --- NEW IMPORT ---
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 
 from . import crud, schemas
-from .supabase_client import get_supabase_client
+from .export import EXPORT_FORMATS, ExportFormat, accepts_gzip, encode_export, gzip_stream
+from .storage import StorageBackend, create_storage_backend
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The storage backend (and its client/connection) is created here, when the
+    # server starts, instead of when the module is imported.
+    app.state.storage = create_storage_backend()
+    yield
+    app.state.storage.close()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # --- ADD THIS MIDDLEWARE SECTION ---
 # This list defines which origins are allowed to make requests to your API.
@@ -29,6 +42,13 @@ app.add_middleware(
 )
 # ---------------------------------
 
+
+# This is the dependency the endpoints use to reach the storage backend
+# created in the lifespan hook above.
+def get_storage(request: Request) -> StorageBackend:
+    return request.app.state.storage
+
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the Adventure Aggregator API!"}
@@ -38,9 +58,9 @@ def read_root():
 @app.post("/adventures/", response_model=schemas.Adventure, status_code=status.HTTP_200_OK)
 def create_or_update_adventure(
     adventure: schemas.AdventureCreate,
-    supabase: Client = Depends(get_supabase_client)
+    storage: StorageBackend = Depends(get_storage)
 ):
-    upserted_adventure = crud.upsert_adventure(supabase=supabase, adventure=adventure)
+    upserted_adventure = crud.upsert_adventure(storage=storage, adventure=adventure)
     if not upserted_adventure:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -57,10 +77,10 @@ def read_adventures(
     order: Optional[str] = "asc",
     activity_type: Optional[str] = None,
     location: Optional[str] = None,
-    supabase: Client = Depends(get_supabase_client)
+    storage: StorageBackend = Depends(get_storage)
 ):
     adventures = crud.get_filtered_adventures(
-        supabase,
+        storage,
         limit=limit,
         offset=offset,
         sort_by=sort_by,
@@ -68,4 +88,42 @@ def read_adventures(
         activity_type=activity_type,
         location=location
     )
-    return adventures
\ No newline at end of file
+    return adventures
+
+
+@app.get("/adventures/export")
+def export_adventures(
+    request: Request,
+    export_format: ExportFormat = Query("ndjson", alias="format"),
+    activity_type: Optional[str] = None,
+    location: Optional[str] = None,
+    storage: StorageBackend = Depends(get_storage)
+):
+    """
+    Streams every adventure matching the filters as NDJSON, CSV or Arrow IPC,
+    ordered by unique_id and gzipped on the fly when the client accepts it.
+
+    Consistency depends on the storage backend. The postgres and sqlite backends
+    read the dump from one snapshot. The default supabase backend reads it page
+    by page over the REST API: no row is skipped or repeated, but rows upserted
+    while the export runs may appear with either their old or new values.
+    """
+    if export_format == "arrow":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail="Arrow export needs the 'pyarrow' package installed on the server."
+            )
+
+    chunks = crud.iter_filtered_adventures(storage, activity_type=activity_type, location=location)
+    body = encode_export(chunks, export_format)
+
+    headers = {"Content-Disposition": f'attachment; filename="adventures.{export_format}"'}
+    if accepts_gzip(request.headers.get("accept-encoding", "")):
+        body = gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+
+    return StreamingResponse(body, media_type=EXPORT_FORMATS[export_format], headers=headers)
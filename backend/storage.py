@@ -0,0 +1,361 @@
+# backend/storage.py
+
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional, Protocol
+
+from . import schemas
+from .config import load_env
+
+# Whitelist the columns we allow sorting on to prevent misuse.
+# Every backend shares this list so results are the same whichever one is active.
+SORTABLE_COLUMNS = ["price", "duration", "departure_date"]
+
+# How many rows a full export reads from the database at a time.
+EXPORT_CHUNK_SIZE = 1000
+
+
+class StorageBackend(Protocol):
+    """
+    The interface every storage backend implements. main.py and crud.py only
+    ever talk to this, so the app doesn't care where the adventures live.
+    """
+
+    def get_filtered_adventures(
+        self,
+        limit: int,
+        offset: int,
+        sort_by: str,
+        order: str,
+        activity_type: Optional[str] = None,
+        location: Optional[str] = None
+    ) -> List[dict]:
+        ...
+
+    def upsert_adventure(self, adventure: schemas.AdventureCreate) -> Optional[dict]:
+        ...
+
+    def iter_adventures(
+        self,
+        activity_type: Optional[str] = None,
+        location: Optional[str] = None,
+        chunk_size: int = EXPORT_CHUNK_SIZE
+    ) -> Iterator[List[dict]]:
+        """Yields every matching adventure, ordered by unique_id, in chunks of at most chunk_size rows."""
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class SupabaseBackend:
+    """
+    Stores adventures in the Supabase 'adventures' table through the REST client.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def get_filtered_adventures(self, limit, offset, sort_by, order, activity_type=None, location=None):
+        query = self.client.table("adventures").select("*")
+
+        # --- Filtering ---
+        # This logic applies filters if they are provided in the URL query.
+        if activity_type:
+            query = query.ilike("activity_type", f"%{activity_type}%")
+        if location:
+            query = query.ilike("location", f"%{location}%")
+
+        # --- Sorting ---
+        # The Supabase library uses 'desc=True' for descending order and
+        # 'desc=False' (or omitting it) for ascending order.
+        if sort_by in SORTABLE_COLUMNS:
+            query = query.order(sort_by, desc=(order.lower() == 'desc'))
+
+        # --- Pagination ---
+        # The .range() method tells the database which slice of results to return.
+        # This must be applied after filtering and sorting.
+        query = query.range(offset, offset + limit - 1)
+
+        response = query.execute()
+
+        if not response.data:
+            return []
+        return response.data
+
+    def upsert_adventure(self, adventure):
+        # Use mode='json' to ensure special types like datetime are converted
+        # to JSON-serializable strings before sending them to the Supabase client.
+        adventure_dict = adventure.model_dump(mode='json')
+
+        # The .upsert() method checks the primary key ('unique_id') to decide
+        # whether to INSERT or UPDATE.
+        response = self.client.table("adventures").upsert(adventure_dict).execute()
+
+        # The response.data will contain a list with the newly created or updated record.
+        if response.data:
+            return response.data[0]
+        return None
+
+    def iter_adventures(self, activity_type=None, location=None, chunk_size=EXPORT_CHUNK_SIZE):
+        # The REST API has no server-side cursors, so this pages with keyset reads
+        # (unique_id > last one seen) instead of offsets. Rows can't be skipped or
+        # repeated when upserts land mid-export, but each chunk is its own query,
+        # so a row updated during the export shows whichever version was read.
+        last_id = None
+        while True:
+            query = self.client.table("adventures").select("*")
+            if activity_type:
+                query = query.ilike("activity_type", f"%{activity_type}%")
+            if location:
+                query = query.ilike("location", f"%{location}%")
+            if last_id is not None:
+                query = query.gt("unique_id", last_id)
+
+            rows = query.order("unique_id").limit(chunk_size).execute().data
+            if not rows:
+                return
+            # PostgREST caps each response at the project's max-rows setting, which
+            # may be below chunk_size, so a short page doesn't mean the end. Only an
+            # empty page does.
+            yield rows
+            last_id = rows[-1]["unique_id"]
+
+    def close(self):
+        pass
+
+
+class SQLBackend(ABC):
+    """
+    Shared SQL for the direct database backends. Subclasses set the parameter
+    placeholder, the case-insensitive LIKE operator and how to get a connection.
+    """
+
+    placeholder = "?"
+    ilike = "LIKE"
+
+    @abstractmethod
+    def _connection(self):
+        """Returns a context manager giving a DB-API connection that commits on success."""
+
+    @abstractmethod
+    def close(self):
+        """Releases the backend's connections."""
+
+    def _export_cursor(self, conn):
+        return conn.cursor()
+
+    def _build_select(self, sort_by, order, activity_type, location):
+        p = self.placeholder
+        sql = "SELECT * FROM adventures"
+        clauses, params = [], []
+
+        # --- Filtering ---
+        if activity_type:
+            clauses.append(f"activity_type {self.ilike} {p}")
+            params.append(f"%{activity_type}%")
+        if location:
+            clauses.append(f"location {self.ilike} {p}")
+            params.append(f"%{location}%")
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+
+        # --- Sorting ---
+        # sort_by is only ever interpolated after being checked against the whitelist.
+        # unique_id is added as a tie-breaker so the order is stable between pages.
+        if sort_by in SORTABLE_COLUMNS:
+            direction = "DESC" if order.lower() == 'desc' else "ASC"
+            sql += f" ORDER BY {sort_by} {direction}, unique_id"
+        return sql, params
+
+    def _rows_to_dicts(self, cursor, rows):
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in rows]
+
+    def get_filtered_adventures(self, limit, offset, sort_by, order, activity_type=None, location=None):
+        sql, params = self._build_select(sort_by, order, activity_type, location)
+        p = self.placeholder
+        sql += f" LIMIT {p} OFFSET {p}"
+        params += [limit, offset]
+
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            return self._rows_to_dicts(cursor, cursor.fetchall())
+
+    def upsert_adventure(self, adventure):
+        adventure_dict = adventure.model_dump(mode='json')
+        columns = list(adventure_dict)
+        p = self.placeholder
+        updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != "unique_id")
+        now = datetime.now(timezone.utc).isoformat()
+
+        sql = (
+            f"INSERT INTO adventures ({', '.join(columns)}, created_at, updated_at) "
+            f"VALUES ({', '.join([p] * (len(columns) + 2))}) "
+            f"ON CONFLICT (unique_id) DO UPDATE SET {updates}, updated_at = excluded.updated_at "
+            f"RETURNING *"
+        )
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, list(adventure_dict.values()) + [now, now])
+            rows = self._rows_to_dicts(cursor, cursor.fetchall())
+        return rows[0] if rows else None
+
+    def iter_adventures(self, activity_type=None, location=None, chunk_size=EXPORT_CHUNK_SIZE):
+        # One query read chunk by chunk, so the whole export comes from a
+        # single snapshot and only chunk_size rows are in memory at once.
+        with self._connection() as conn:
+            yield from self._iter_chunks(conn, activity_type, location, chunk_size)
+
+    def _iter_chunks(self, conn, activity_type, location, chunk_size):
+        sql, params = self._build_select(None, "asc", activity_type, location)
+        sql += " ORDER BY unique_id"
+
+        cursor = self._export_cursor(conn)
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield self._rows_to_dicts(cursor, rows)
+
+
+class PostgresBackend(SQLBackend):
+    """
+    Talks to the Postgres database directly with psycopg, skipping the REST layer.
+    Useful for bulk jobs and when running next to the database.
+    """
+
+    placeholder = "%s"
+    ilike = "ILIKE"
+
+    def __init__(self, dsn: str):
+        # Imported here so psycopg is only needed when this backend is chosen.
+        from psycopg_pool import ConnectionPool
+        self.pool = ConnectionPool(dsn, open=True)
+
+    def _connection(self):
+        return self.pool.connection()
+
+    def _export_cursor(self, conn):
+        # A named cursor is a server-side cursor: Postgres keeps the result set
+        # and sends it over as it's fetched, instead of all at once.
+        return conn.cursor(name="adventures_export")
+
+    def close(self):
+        self.pool.close()
+
+
+class SQLiteBackend(SQLBackend):
+    """
+    A local SQLite database, for offline work and tests. Defaults to an
+    in-memory database that disappears when the process exits.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        # A single connection is shared between FastAPI's worker threads,
+        # so every use of it is serialised by the lock.
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        if path != ":memory:":
+            # WAL lets an export read from its own connection without blocking writers.
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS adventures (
+                unique_id TEXT PRIMARY KEY,
+                provider_name TEXT NOT NULL,
+                trip_name TEXT NOT NULL,
+                url TEXT NOT NULL,
+                image_url TEXT,
+                price REAL NOT NULL,
+                currency TEXT NOT NULL,
+                departure_date TEXT NOT NULL,
+                duration INTEGER,
+                location TEXT,
+                activity_type TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+
+    def _connection(self):
+        return _LockedConnection(self.conn, self.lock)
+
+    def iter_adventures(self, activity_type=None, location=None, chunk_size=EXPORT_CHUNK_SIZE):
+        # The shared connection's lock must not be held while the response streams:
+        # each chunk is pulled on the threadpool, and if requests waiting on the lock
+        # fill the threadpool the export can never finish and the app deadlocks.
+        if self.path == ":memory:":
+            # An in-memory database can't be opened from a second connection, so
+            # the result is read in full under the lock and then streamed. Memory
+            # use grows with the result here, unlike the file and other backends.
+            with self._connection() as conn:
+                chunks = list(self._iter_chunks(conn, activity_type, location, chunk_size))
+            yield from chunks
+            return
+
+        # A file database gets its own connection. Its read transaction keeps the
+        # export on one snapshot while writes carry on through the shared one.
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        try:
+            conn.execute("BEGIN")
+            yield from self._iter_chunks(conn, activity_type, location, chunk_size)
+        finally:
+            conn.close()
+
+    def close(self):
+        self.conn.close()
+
+
+class _LockedConnection:
+    # Holds the SQLite lock for the duration of a 'with' block and commits on success.
+    def __init__(self, conn, lock):
+        self.conn = conn
+        self.lock = lock
+
+    def __enter__(self):
+        self.lock.acquire()
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.conn.commit()
+            else:
+                self.conn.rollback()
+        finally:
+            self.lock.release()
+
+
+def create_storage_backend() -> StorageBackend:
+    """
+    Builds the backend named by STORAGE_BACKEND ('supabase', 'postgres' or 'sqlite').
+    Called from the app's lifespan hook rather than at import time, so importing
+    `backend` is cheap and nothing is checked until the app actually starts.
+    """
+    load_env()
+
+    kind = os.environ.get("STORAGE_BACKEND", "supabase").lower()
+
+    if kind == "supabase":
+        from .supabase_client import get_supabase_client
+        return SupabaseBackend(get_supabase_client())
+
+    if kind == "postgres":
+        dsn = os.environ.get("DATABASE_URL")
+        if not dsn:
+            raise ValueError("DATABASE_URL must be set in the .env file to use the postgres backend")
+        return PostgresBackend(dsn)
+
+    if kind == "sqlite":
+        return SQLiteBackend(os.environ.get("SQLITE_PATH", ":memory:"))
+
+    raise ValueError(f"Unknown STORAGE_BACKEND '{kind}'. Use 'supabase', 'postgres' or 'sqlite'.")
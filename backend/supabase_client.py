@@ -1,25 +1,28 @@
 # backend/supabase_client.py
 import os
-from supabase import create_client, Client
-from dotenv import load_dotenv
-from pathlib import Path
+from functools import lru_cache
 
-# --- IMPORTANT ---
-# This code now expects the .env file to be in the SAME directory as this script.
-# So, your .env file MUST be inside the `backend/` folder.
-env_path = Path(__file__).parent.parent / ".env"
-load_dotenv(dotenv_path=env_path)
+from .config import load_env
 
-url: str = os.environ.get("SUPABASE_URL")
-key: str = os.environ.get("SUPABASE_KEY")
+# Nothing is loaded or checked when this module is imported; that happens the
+# first time a client is actually needed, so importing `backend` stays fast
+# and works offline without credentials.
 
-if not url or not key:
-    raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in the .env file in your project root")
 
-supabase: Client = create_client(url, key)
+@lru_cache(maxsize=None)
+def get_supabase_client():
+    """
+    Creates the Supabase client on first call and returns the same one afterwards.
+    Raises ValueError if the credentials are missing.
+    """
+    load_env()
 
-# --- ADD THIS FUNCTION ---
-# This is the dependency that main.py needs.
-# It makes the global 'supabase' client available to FastAPI's Depends system.
-def get_supabase_client() -> Client:
-    return supabase
\ No newline at end of file
+    url: str = os.environ.get("SUPABASE_URL")
+    key: str = os.environ.get("SUPABASE_KEY")
+
+    if not url or not key:
+        raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in the .env file in your project root")
+
+    # The supabase package is slow to import, so it's deferred until here.
+    from supabase import create_client
+    return create_client(url, key)
@@ -0,0 +1,2 @@
+# Root conftest: its presence makes pytest put the repo root on sys.path, so
+# tests can import `backend` and the scrape_* scripts under a plain `pytest`.
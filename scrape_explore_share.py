@@ -3,12 +3,185 @@
 import requests
 import pandas as pd
 import time
+import hashlib
+import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from pathlib import Path
 
-def scrape_explore_share():
+# --- Detail enrichment settings ---
+# Trip pages are cached on disk so repeat runs only send cheap conditional requests.
+CACHE_DIR = Path(__file__).parent / ".cache" / "explore_share"
+CACHE_TTL_SECONDS = 24 * 60 * 60  # Within this window a cached page is used without asking the server at all.
+MAX_DETAIL_WORKERS = 8
+
+# requests.Session isn't guaranteed to be thread-safe, so each worker thread gets its own.
+_thread_local = threading.local()
+
+
+def _get_session():
+    if not hasattr(_thread_local, "session"):
+        _thread_local.session = requests.Session()
+    return _thread_local.session
+
+
+def cached_get(url, ttl=CACHE_TTL_SECONDS):
+    """
+    GETs a URL through the on-disk cache and returns the response body.
+    Fresh entries (younger than `ttl`) are returned straight away. Stale ones are
+    revalidated with If-None-Match / If-Modified-Since, and a 304 reuses the cached body.
+    """
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    cache_file = CACHE_DIR / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    entry = None
+    if cache_file.exists():
+        try:
+            entry = json.loads(cache_file.read_text(encoding="utf-8"))
+        except ValueError:
+            entry = None
+        # A half-written, corrupt or foreign entry is just treated as a miss.
+        if not (isinstance(entry, dict) and "fetched_at" in entry and "body" in entry):
+            entry = None
+
+    if entry and time.time() - entry["fetched_at"] < ttl:
+        return entry["body"]
+
+    headers = {}
+    if entry and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry and entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+
+    response = _get_session().get(url, headers=headers, timeout=30)
+
+    if response.status_code == 304:
+        # 304 isn't an error to raise_for_status(), but without a cached body
+        # there's nothing to return, so it must not be stored as an empty page.
+        if not entry:
+            raise requests.HTTPError(f"Got 304 Not Modified for {url} but nothing is cached", response=response)
+        entry["fetched_at"] = time.time()
+        # The server may send new validators with a 304; keep them for next time.
+        entry["etag"] = response.headers.get("ETag", entry.get("etag"))
+        entry["last_modified"] = response.headers.get("Last-Modified", entry.get("last_modified"))
+    else:
+        response.raise_for_status()
+        entry = {
+            "url": url,
+            "fetched_at": time.time(),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "body": response.text,
+        }
+
+    # Write to a temp file and rename, so a crash never leaves a broken entry behind.
+    tmp_file = cache_file.with_suffix(f".{threading.get_ident()}.tmp")
+    tmp_file.write_text(json.dumps(entry), encoding="utf-8")
+    tmp_file.replace(cache_file)
+    return entry["body"]
+
+
+def _join_names(value):
+    """
+    Flattens a schema.org value into 'A | B | C'. Accepts a plain string, a list,
+    or an ItemList, where each entry is a string, a named object, or a ListItem
+    whose name is on its 'item'. Returns None if no names are found.
+    """
+    if isinstance(value, str):
+        return value.strip() or None
+    if isinstance(value, dict):
+        value = value.get('itemListElement', [value])
+    if not isinstance(value, list):
+        return None
+
+    names = []
+    for entry in value:
+        if isinstance(entry, str):
+            names.append(entry)
+        elif isinstance(entry, dict):
+            item = entry.get('item')
+            name = item.get('name') if isinstance(item, dict) else None
+            names.append(name or entry.get('name'))
+    names = [n.strip() for n in names if isinstance(n, str) and n.strip()]
+    return ' | '.join(names) or None
+
+
+def parse_trip_details(html):
+    """
+    Pulls the richer trip data out of the schema.org JSON-LD blocks on a trip page.
+    Any field the page doesn't publish is left as None.
+    """
+    details = {'itinerary': None, 'max_group_size': None, 'inclusions': None, 'description': None}
+
+    for block in re.findall(r'<script[^>]*type="application/ld\+json"[^>]*>(.*?)</script>', html, re.S):
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+
+        # A page can hold a single object, a list, or an @graph of objects.
+        if isinstance(data, dict) and "@graph" in data:
+            data = data["@graph"]
+        for item in data if isinstance(data, list) else [data]:
+            if not isinstance(item, dict):
+                continue
+
+            # The itinerary is usually an ItemList of days, but can be plain text.
+            if details['itinerary'] is None:
+                details['itinerary'] = _join_names(item.get('itinerary'))
+
+            if item.get('maximumAttendeeCapacity') and details['max_group_size'] is None:
+                details['max_group_size'] = item.get('maximumAttendeeCapacity')
+
+            # 'offers' can be a single Offer or a list of them.
+            offers = item.get('offers')
+            offers = offers if isinstance(offers, list) else [offers]
+            for offer in offers:
+                if isinstance(offer, dict) and details['inclusions'] is None:
+                    included = offer.get('includesObject')
+                    if isinstance(included, dict):
+                        included = [included]
+                    details['inclusions'] = _join_names(included)
+
+            if item.get('description') and details['description'] is None:
+                details['description'] = item.get('description')
+
+    return details
+
+
+def enrich_trips(trip_urls, max_workers=MAX_DETAIL_WORKERS):
+    """
+    Fetches the detail page of every trip concurrently. `trip_urls` maps post_id to
+    permalink, so each trip is fetched once no matter how many departures it has.
+    Returns a dict of post_id -> details. Trips that fail are skipped, not fatal.
+    """
+    print(f"\n--- Enriching {len(trip_urls)} unique trips with detail pages ({max_workers} workers)... ---")
+    details_by_trip = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(cached_get, url): post_id
+            for post_id, url in trip_urls.items() if url
+        }
+        for future in as_completed(futures):
+            post_id = futures[future]
+            try:
+                details_by_trip[post_id] = parse_trip_details(future.result())
+            except Exception as e:
+                print(f"    - Could not fetch details for trip {post_id}: {e}")
+
+    print(f"    - Enriched {len(details_by_trip)} of {len(trip_urls)} trips.")
+    return details_by_trip
+
+
+def scrape_explore_share(enrich=True):
     """
     Scrapes all trips from Explore Share using the correct Algolia index name
     and authentication-in-URL method, as discovered through debugging.
+    With `enrich=True`, each departure also gets the extra fields from its trip's
+    detail page (see enrich_trips).
     """
     print("🚀 Starting Explore Share Definitive API Scraper...")
 
@@ -27,6 +200,7 @@ def scrape_explore_share():
     }
     
     all_departures = []
+    trip_urls = {}  # post_id -> permalink, used to fetch each trip's details once
     page_number = 0
     
     while True:
@@ -73,6 +247,7 @@ def scrape_explore_share():
                     'image_url': trip.get('images', {}).get('medium', {}).get('url'),
                     'provider_name': 'Explore Share'
                 }
+                trip_urls[trip.get('post_id')] = trip.get('permalink')
 
                 for group in open_groups:
                     departure_data = base_trip_info.copy()
@@ -92,6 +267,12 @@ def scrape_explore_share():
             print(f"    - An error occurred: {e}")
             break
 
+    if enrich and trip_urls:
+        details_by_trip = enrich_trips(trip_urls)
+        empty_details = parse_trip_details("")
+        for departure in all_departures:
+            departure.update(details_by_trip.get(departure['trip_id'], empty_details))
+
     print(f"\n✅ API Scrape complete. Total granular departures extracted: {len(all_departures)}")
     return all_departures
 
@@ -0,0 +1,143 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import schemas
+from backend.export import accepts_gzip
+from backend.main import app
+from backend.storage import SQLiteBackend, SupabaseBackend
+
+
+def adventure(unique_id):
+    return schemas.AdventureCreate(
+        unique_id=unique_id,
+        provider_name="Explore Share",
+        trip_name=f"Trip {unique_id}",
+        url=f"https://example.com/{unique_id}",
+        price=100.0,
+        currency="EUR",
+        departure_date="2026-06-01T00:00:00Z",
+        activity_type="Hiking",
+    )
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", True),
+    ("gzip, deflate, br", True),
+    ("gzip;q=0.5", True),
+    ("gzip;q=0", False),
+    ("gzip; q=0.0, deflate", False),
+    ("*", True),
+    ("*;q=0", False),
+    ("identity", False),
+    ("", False),
+])
+def test_accepts_gzip(header, expected):
+    assert accepts_gzip(header) is expected
+
+
+@pytest.mark.parametrize("path", [":memory:", "file"])
+def test_sqlite_export_streams_every_row(tmp_path, path):
+    storage = SQLiteBackend(str(tmp_path / "adventures.db") if path == "file" else path)
+    for i in range(5):
+        storage.upsert_adventure(adventure(f"id-{i}"))
+
+    chunks = list(storage.iter_adventures(chunk_size=2))
+    assert [len(c) for c in chunks] == [2, 2, 1]
+    assert [row["unique_id"] for c in chunks for row in c] == [f"id-{i}" for i in range(5)]
+
+
+def test_sqlite_file_export_does_not_block_writes(tmp_path):
+    storage = SQLiteBackend(str(tmp_path / "adventures.db"))
+    for i in range(3):
+        storage.upsert_adventure(adventure(f"id-{i}"))
+
+    export = storage.iter_adventures(chunk_size=1)
+    first = next(export)
+    # The export's read transaction is open; a write must still go through,
+    # and the export must keep seeing its own snapshot.
+    storage.upsert_adventure(adventure("id-9"))
+    rest = list(export)
+    assert [row["unique_id"] for c in [first] + rest for row in c] == ["id-0", "id-1", "id-2"]
+
+
+class FakeQuery:
+    # Mimics the PostgREST query builder, capping every page at max_rows.
+    def __init__(self, rows, max_rows):
+        self.rows, self.max_rows, self.after, self.limit_to = rows, max_rows, None, None
+
+    def select(self, *_):
+        return self
+
+    def gt(self, _column, value):
+        self.after = value
+        return self
+
+    def order(self, _column):
+        return self
+
+    def limit(self, n):
+        self.limit_to = n
+        return self
+
+    def execute(self):
+        rows = [r for r in self.rows if self.after is None or r["unique_id"] > self.after]
+        return type("Response", (), {"data": rows[:min(self.limit_to, self.max_rows)]})
+
+
+class FakeSupabase:
+    def __init__(self, rows, max_rows):
+        self.rows, self.max_rows = rows, max_rows
+
+    def table(self, _name):
+        return FakeQuery(self.rows, self.max_rows)
+
+
+def test_supabase_export_continues_past_max_rows_cap():
+    rows = [{"unique_id": f"id-{i:02}"} for i in range(25)]
+    storage = SupabaseBackend(FakeSupabase(rows, max_rows=10))
+    exported = [row for chunk in storage.iter_adventures(chunk_size=1000) for row in chunk]
+    assert exported == rows
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("STORAGE_BACKEND", "sqlite")
+    monkeypatch.setenv("SQLITE_PATH", ":memory:")
+    with TestClient(app) as client:
+        for i in range(3):
+            client.post("/adventures/", json=adventure(f"id-{i}").model_dump(mode="json"))
+        yield client
+
+
+def test_export_endpoint_ndjson_gzip(client):
+    response = client.get("/adventures/export", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    lines = response.text.splitlines()
+    assert [json.loads(line)["unique_id"] for line in lines] == ["id-0", "id-1", "id-2"]
+
+
+def test_export_endpoint_respects_gzip_q0(client):
+    response = client.get("/adventures/export?format=csv", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "content-encoding" not in response.headers
+    assert response.text.splitlines()[0].startswith("unique_id,provider_name")
+    assert len(response.text.splitlines()) == 4
+
+
+def test_export_endpoint_rejects_unknown_format(client):
+    assert client.get("/adventures/export?format=xml").status_code == 422
+
+
+def test_export_formats_listed_in_openapi(client):
+    params = client.get("/openapi.json").json()["paths"]["/adventures/export"]["get"]["parameters"]
+    schema = next(p for p in params if p["name"] == "format")["schema"]
+    assert schema["enum"] == ["ndjson", "csv", "arrow"]
+
+
+def test_export_endpoint_arrow(client):
+    pa = pytest.importorskip("pyarrow")
+    response = client.get("/adventures/export?format=arrow", headers={"Accept-Encoding": "identity"})
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column("unique_id").to_pylist() == ["id-0", "id-1", "id-2"]
@@ -0,0 +1,178 @@
+import json
+
+import pytest
+import requests
+
+import scrape_explore_share as es
+
+
+def page(*blocks):
+    # Builds a trip page with one JSON-LD <script> per block.
+    return "".join(
+        f'<script type="application/ld+json">{json.dumps(block)}</script>' for block in blocks
+    )
+
+
+def test_itinerary_from_list_items():
+    html = page({
+        "@type": "Trip",
+        "itinerary": {
+            "@type": "ItemList",
+            "itemListElement": [
+                {"@type": "ListItem", "item": {"name": "Day 1"}},
+                {"@type": "ListItem", "item": {"name": "Day 2"}},
+            ],
+        },
+    })
+    assert es.parse_trip_details(html)["itinerary"] == "Day 1 | Day 2"
+
+
+def test_itinerary_plain_string():
+    html = page({"@type": "Trip", "itinerary": "Day 1 hike"})
+    assert es.parse_trip_details(html)["itinerary"] == "Day 1 hike"
+
+
+def test_empty_itinerary_lets_later_block_fill_it():
+    html = page(
+        {"@type": "Trip", "itinerary": {"@type": "ItemList", "itemListElement": [{"@type": "ListItem"}]}},
+        {"@type": "TouristTrip", "itinerary": [{"name": "Summit day"}]},
+    )
+    assert es.parse_trip_details(html)["itinerary"] == "Summit day"
+
+
+def test_inclusions_from_list_of_offers():
+    html = page({
+        "@type": "Trip",
+        "maximumAttendeeCapacity": 6,
+        "offers": [
+            {"@type": "Offer", "price": 900},
+            {"@type": "Offer", "includesObject": [{"name": "Guide"}, {"name": "Hut nights"}]},
+        ],
+    })
+    details = es.parse_trip_details(html)
+    assert details["inclusions"] == "Guide | Hut nights"
+    assert details["max_group_size"] == 6
+
+
+def test_page_without_json_ld():
+    assert es.parse_trip_details("<html></html>") == {
+        "itinerary": None, "max_group_size": None, "inclusions": None, "description": None
+    }
+
+
+class FakeResponse:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(str(self.status_code))
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent_headers = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.sent_headers.append(headers)
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    monkeypatch.setattr(es, "CACHE_DIR", tmp_path)
+    fake = FakeSession()
+    monkeypatch.setattr(es, "_get_session", lambda: fake)
+    return fake
+
+
+def test_304_without_cache_entry_is_an_error(session):
+    session.responses = [FakeResponse(304)]
+    with pytest.raises(requests.HTTPError):
+        es.cached_get("https://example.com/trip")
+
+
+def test_304_reuses_body_and_updates_validators(session):
+    url = "https://example.com/trip"
+    session.responses = [
+        FakeResponse(200, "<html>trip</html>", {"ETag": '"v1"'}),
+        FakeResponse(304, headers={"ETag": '"v2"'}),
+        FakeResponse(304),
+    ]
+    assert es.cached_get(url, ttl=0) == "<html>trip</html>"
+    assert es.cached_get(url, ttl=0) == "<html>trip</html>"
+    assert es.cached_get(url, ttl=0) == "<html>trip</html>"
+    assert session.sent_headers[1] == {"If-None-Match": '"v1"'}
+    assert session.sent_headers[2] == {"If-None-Match": '"v2"'}
+
+
+def test_fresh_entry_is_served_without_a_request(session):
+    session.responses = [FakeResponse(200, "<html>trip</html>", {"ETag": '"v1"'})]
+    assert es.cached_get("https://example.com/trip") == "<html>trip</html>"
+    assert es.cached_get("https://example.com/trip") == "<html>trip</html>"
+    assert len(session.sent_headers) == 1
+
+
+@pytest.mark.parametrize("contents", ['{"etag": "x"}', '["not", "a", "dict"]', "null", "{broken"])
+def test_malformed_cache_entry_is_a_miss(session, contents):
+    url = "https://example.com/trip"
+    cache_file = es.CACHE_DIR / f"{es.hashlib.sha256(url.encode()).hexdigest()}.json"
+    cache_file.write_text(contents, encoding="utf-8")
+    session.responses = [FakeResponse(200, "<html>trip</html>")]
+    assert es.cached_get(url) == "<html>trip</html>"
+    assert session.sent_headers == [{}]
+
+
+class UrlSession:
+    # Answers by URL, since enrichment fetches pages from several threads at once.
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requested.append(url)
+        if url not in self.pages:
+            return FakeResponse(500)
+        return FakeResponse(200, self.pages[url])
+
+
+def test_scrape_enriches_every_departure_fetching_each_trip_once(tmp_path, monkeypatch):
+    hits = [
+        {
+            "post_id": 1, "objectID": "1", "post_title": "Mont Blanc", "permalink": "https://example.com/1",
+            "trip_currency": "EUR",
+            "open_groups": [{"departureDate": "2026-07-01", "price": 900}, {"departureDate": "2026-08-01", "price": 950}],
+        },
+        {
+            "post_id": 2, "objectID": "2", "post_title": "Matterhorn", "permalink": "https://example.com/2",
+            "trip_currency": "CHF",
+            "open_groups": [{"departureDate": "2026-07-15", "price": 1500}],
+        },
+    ]
+    search_pages = [{"results": [{"hits": hits}]}, {"results": [{"hits": []}]}]
+
+    class SearchResponse:
+        def __init__(self, data):
+            self.data = data
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return self.data
+
+    monkeypatch.setattr(es.requests, "post", lambda *a, **kw: SearchResponse(search_pages.pop(0)))
+    monkeypatch.setattr(es.time, "sleep", lambda _: None)
+    monkeypatch.setattr(es, "CACHE_DIR", tmp_path)
+    # Trip 2's page fails with a 500; the run must carry on without it.
+    fake = UrlSession({"https://example.com/1": page({"@type": "Trip", "itinerary": "Day 1 hike"})})
+    monkeypatch.setattr(es, "_get_session", lambda: fake)
+
+    departures = es.scrape_explore_share()
+
+    assert sorted(fake.requested) == ["https://example.com/1", "https://example.com/2"]
+    assert [(d["trip_id"], d["itinerary"]) for d in departures] == [(1, "Day 1 hike"), (1, "Day 1 hike"), (2, None)]
+    assert all("inclusions" in d and "max_group_size" in d for d in departures)
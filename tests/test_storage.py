@@ -0,0 +1,146 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from backend import schemas, storage
+from backend.check_import_time import DEFAULT_BUDGET_MS, measure_import_time
+from backend.storage import PostgresBackend, SQLiteBackend, SupabaseBackend, create_storage_backend
+
+REPO_ROOT = Path(__file__).parent.parent
+
+
+def adventure(unique_id, price=100.0, activity_type="Hiking", location="Nepal", duration=None):
+    return schemas.AdventureCreate(
+        unique_id=unique_id,
+        provider_name="Explore Share",
+        trip_name=f"Trip {unique_id}",
+        url=f"https://example.com/{unique_id}",
+        price=price,
+        currency="EUR",
+        departure_date="2026-06-01T00:00:00Z",
+        duration=duration,
+        location=location,
+        activity_type=activity_type,
+    )
+
+
+def ids(rows):
+    return [row["unique_id"] for row in rows]
+
+
+@pytest.fixture
+def db():
+    backend = SQLiteBackend(":memory:")
+    backend.upsert_adventure(adventure("a", price=300, activity_type="Mountaineering", location="Nepal"))
+    backend.upsert_adventure(adventure("b", price=100, activity_type="Ski Touring", location="France"))
+    backend.upsert_adventure(adventure("c", price=200, activity_type="Hiking", location="Nepal"))
+    backend.upsert_adventure(adventure("d", price=100, activity_type="Hiking", location="Peru"))
+    yield backend
+    backend.close()
+
+
+def query(db, **kwargs):
+    params = dict(limit=20, offset=0, sort_by="price", order="asc")
+    params.update(kwargs)
+    return db.get_filtered_adventures(**params)
+
+
+def test_filters_are_case_insensitive_substrings(db):
+    assert ids(query(db, activity_type="hik")) == ["d", "c"]
+    assert ids(query(db, location="NEP")) == ["c", "a"]
+    assert ids(query(db, activity_type="hiking", location="peru")) == ["d"]
+
+
+def test_sort_order_and_unique_id_tie_breaker(db):
+    assert ids(query(db, order="asc")) == ["b", "d", "c", "a"]
+    # b and d share a price; unique_id keeps them in the same order either way.
+    assert ids(query(db, order="DESC")) == ["a", "c", "b", "d"]
+
+
+def test_sort_column_outside_whitelist_is_ignored(db):
+    rows = query(db, sort_by="trip_name; DROP TABLE adventures")
+    assert sorted(ids(rows)) == ["a", "b", "c", "d"]
+    assert len(query(db)) == 4
+
+
+def test_limit_and_offset_page_through_results(db):
+    pages = [ids(query(db, limit=3, offset=offset)) for offset in (0, 3, 6)]
+    assert pages == [["b", "d", "c"], ["a"], []]
+
+
+def test_upsert_updates_existing_row(db):
+    before = query(db, activity_type="ski")[0]
+    after = db.upsert_adventure(adventure("b", price=150, activity_type="Ski Touring", location="France"))
+    assert after["price"] == 150
+    assert after["created_at"] == before["created_at"]
+    assert len(query(db)) == 4
+
+
+@pytest.fixture
+def env(monkeypatch):
+    # Keep a developer's real .env out of these tests.
+    monkeypatch.setattr(storage, "load_env", lambda: None)
+    for name in ("STORAGE_BACKEND", "DATABASE_URL", "SQLITE_PATH"):
+        monkeypatch.delenv(name, raising=False)
+    return monkeypatch
+
+
+def test_create_storage_backend_sqlite(env):
+    env.setenv("STORAGE_BACKEND", "SQLite")
+    backend = create_storage_backend()
+    assert isinstance(backend, SQLiteBackend)
+    assert backend.path == ":memory:"
+    backend.close()
+
+
+def test_create_storage_backend_supabase_is_default(env):
+    env.setattr("backend.supabase_client.get_supabase_client", lambda: "client")
+    backend = create_storage_backend()
+    assert isinstance(backend, SupabaseBackend)
+    assert backend.client == "client"
+
+
+def test_create_storage_backend_postgres(env):
+    env.setenv("STORAGE_BACKEND", "postgres")
+    env.setenv("DATABASE_URL", "postgresql://localhost/adventures")
+    env.setattr(PostgresBackend, "__init__", lambda self, dsn: setattr(self, "dsn", dsn))
+    backend = create_storage_backend()
+    assert isinstance(backend, PostgresBackend)
+    assert backend.dsn == "postgresql://localhost/adventures"
+
+
+def test_create_storage_backend_postgres_needs_database_url(env):
+    env.setenv("STORAGE_BACKEND", "postgres")
+    with pytest.raises(ValueError, match="DATABASE_URL"):
+        create_storage_backend()
+
+
+def test_create_storage_backend_unknown(env):
+    env.setenv("STORAGE_BACKEND", "mongo")
+    with pytest.raises(ValueError, match="Unknown STORAGE_BACKEND 'mongo'"):
+        create_storage_backend()
+
+
+def test_import_needs_no_credentials_or_supabase_package():
+    # Setting a module to None in sys.modules makes importing it fail, which
+    # stands in for the package not being installed.
+    code = (
+        "import sys\n"
+        "sys.modules['supabase'] = None\n"
+        "sys.modules['dotenv'] = None\n"
+        "import backend.main\n"
+        "assert 'supabase' not in [m for m in sys.modules if sys.modules[m] is not None]\n"
+    )
+    env = {k: v for k, v in os.environ.items() if not k.startswith("SUPABASE_")}
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=REPO_ROOT, env=env, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_import_time_is_within_budget():
+    total_ms, slowest = measure_import_time()
+    assert total_ms < DEFAULT_BUDGET_MS, f"import took {total_ms:.0f} ms; slowest: {slowest}"